@@ -0,0 +1,77 @@
+"""Numba-compiled numeric kernels for the per-frame landmark and pose math.
+
+Kernels take the (8, 3) key landmark array produced by FaceDetector, with
+rows in `FaceDetector.key_landmarks` order:
+forehead_center, forehead_left, forehead_right, nose_tip, chin,
+left_temple, right_temple, top_head.
+"""
+
+import numpy as np
+from numba import njit
+
+FOREHEAD = 0
+NOSE = 3
+CHIN = 4
+LEFT_TEMPLE = 5
+RIGHT_TEMPLE = 6
+
+@njit(cache=True, fastmath=True)
+def head_geometry(key_points):
+    """Compute (head_width, head_height, yaw, pitch, roll) from the key landmarks in one pass."""
+    forehead_y = key_points[FOREHEAD, 1]
+    nose_y = key_points[NOSE, 1]
+    chin_y = key_points[CHIN, 1]
+    left_x = key_points[LEFT_TEMPLE, 0]
+    left_y = key_points[LEFT_TEMPLE, 1]
+    right_x = key_points[RIGHT_TEMPLE, 0]
+    right_y = key_points[RIGHT_TEMPLE, 1]
+
+    head_width = abs(left_x - right_x)
+    head_height = abs(forehead_y - chin_y)
+
+    # The temple-based yaw estimate compared the temple span with itself and
+    # carries no signal, so yaw is not estimated yet
+    yaw = 0.0
+
+    # Pitch from the forehead to nose ratio (0.3 is the expected nose position)
+    nose_offset = (nose_y - forehead_y) / head_height if head_height > 0 else 0.0
+    pitch = np.arctan2(nose_offset - 0.3, 0.7)
+
+    # Roll (tilt) using temple height difference
+    roll = np.arctan2(left_y - right_y, head_width) if head_width > 0 else 0.0
+
+    return head_width, head_height, yaw, pitch, roll
+
+@njit(cache=True, fastmath=True)
+def compute_pose(key_points, frame_width, frame_height, scale_per_px, hat_offset_z):
+    """
+    Compute the raw hat pose as (pos x, y, z, rot x, y, z, scale).
+
+    scale_per_px is the hat scale per pixel of head width, i.e.
+    HAT_SCALE_FACTOR / reference head width.
+    """
+    forehead_x = key_points[FOREHEAD, 0]
+    forehead_y = key_points[FOREHEAD, 1]
+    head_width, head_height, yaw, pitch, roll = head_geometry(key_points)
+
+    pose = np.empty(7, dtype=np.float64)
+
+    # Position on top of head: 40% of head height up from the forehead
+    pose[0] = min(max(forehead_x / frame_width, 0.0), 1.0)
+    pose[1] = min(max((forehead_y - head_height * 0.4) / frame_height, 0.0), 1.0)
+    pose[2] = hat_offset_z
+
+    # Follow head rotation with some damping
+    pose[3] = pitch * 0.8
+    pose[4] = yaw * 0.9
+    pose[5] = roll * 0.7
+
+    # Scale proportional to head width
+    pose[6] = min(max(head_width * scale_per_px, 0.5), 4.0)
+
+    return pose
+
+# Compile (or load from cache) at import instead of on the first frame
+_warmup = np.zeros((8, 3), dtype=np.float32)
+head_geometry(_warmup)
+compute_pose(_warmup, 1, 1, 1.0, 0.0)
@@ -6,6 +6,7 @@ class Config:
     # Server settings
     HOST = "localhost"
     PORT = 8000
+    RELOAD = False  # Auto-reload on code changes (development only)
     
     # Face detection settings
     DETECTION_CONFIDENCE = 0.5
@@ -19,6 +20,17 @@ class Config:
     DETECTION_WIDTH = 320  # Smaller size for face detection
     DETECTION_HEIGHT = 240
     
+    # Landmark cache settings (skip face mesh on near-static frames)
+    CACHE_THUMBNAIL_SIZE = 32        # Side of the grayscale thumbnail used for motion checks
+    CACHE_STATIC_THRESHOLD = 1.0     # Mean absolute pixel delta below which the last response is resent
+    CACHE_MOTION_THRESHOLD = 2.0     # Mean absolute pixel delta below which landmarks are reused
+    CACHE_RESET_THRESHOLD = 25.0     # Mean absolute pixel delta above which smoothing is reset
+    CACHE_MAX_REUSE_FRAMES = 5       # Force a full detection at least every N frames (either reuse)
+    
+    # Region-of-interest detection settings
+    ROI_SIZE = 192        # Side of the square crop fed to face mesh when tracking
+    ROI_EXPANSION = 0.2   # Grow the last face box by 20% before cropping
+    
     # Hat positioning settings
     HAT_SCALE_FACTOR = 1.3  # Fine-tuned for optimal size
     HAT_OFFSET_Y = -0.6   # Positioned properly on top of head
@@ -36,5 +48,8 @@ class Config:
     # Smoothing settings
     SMOOTHING_FACTOR = 0.3  # For moving average (0 = no smoothing, 1 = max smoothing)
     
+    # Debug settings
+    DEBUG_DRAW_LANDMARKS = False  # Draw landmarks onto a copy of the frame in draw_landmarks
+    
     # WebSocket settings
     MAX_MESSAGE_SIZE = 1024 * 1024 * 5  # 5MB max message size
\ No newline at end of file
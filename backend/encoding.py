@@ -0,0 +1,56 @@
+"""Image encoding helpers (bytes and base64) for tools and debugging.
+
+Kept out of the frame-processing modules: the WebSocket path transports
+raw bytes and never needs base64.
+"""
+
+import base64
+import cv2
+import numpy as np
+from utils import bytes_to_opencv_image
+
+def opencv_image_to_bytes(image: np.ndarray, format: str = '.jpg') -> bytes:
+    """
+    Convert OpenCV image to bytes.
+    
+    Args:
+        image: OpenCV image (BGR format)
+        format: Image format ('.jpg', '.png', etc.)
+        
+    Returns:
+        Image data as bytes
+    """
+    _, buffer = cv2.imencode(format, image)
+    return buffer.tobytes()
+
+def base64_to_opencv_image(base64_string: str) -> np.ndarray:
+    """
+    Convert base64 string to OpenCV image.
+    
+    Args:
+        base64_string: Base64 encoded image
+        
+    Returns:
+        OpenCV image (BGR format)
+    """
+    # Remove data URL prefix if present
+    if ',' in base64_string:
+        base64_string = base64_string.split(',')[1]
+    
+    # Decode base64
+    image_bytes = base64.b64decode(base64_string)
+    return bytes_to_opencv_image(image_bytes)
+
+def opencv_image_to_base64(image: np.ndarray, format: str = '.jpg') -> str:
+    """
+    Convert OpenCV image to base64 string.
+    
+    Args:
+        image: OpenCV image (BGR format)  
+        format: Image format ('.jpg', '.png', etc.)
+        
+    Returns:
+        Base64 encoded image string
+    """
+    image_bytes = opencv_image_to_bytes(image, format)
+    return base64.b64encode(image_bytes).decode('utf-8')
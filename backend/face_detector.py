@@ -3,8 +3,9 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from config import Config
+from _kernels import head_geometry
 
 class FaceDetector:
     """Face detection using MediaPipe Face Mesh."""
@@ -18,7 +19,7 @@ class FaceDetector:
         # Initialize face mesh with configuration
         self.face_mesh = self.mp_face_mesh.FaceMesh(
             max_num_faces=Config.MAX_NUM_FACES,
-            refine_landmarks=True,
+            refine_landmarks=False,  # Iris/lip refinement is unused by the key landmarks
             min_detection_confidence=Config.DETECTION_CONFIDENCE,
             min_tracking_confidence=Config.TRACKING_CONFIDENCE
         )
@@ -34,56 +35,124 @@ class FaceDetector:
             'right_temple': 454,      # Right temple
             'top_head': 10,           # Top of head estimation
         }
+        self._key_names = list(self.key_landmarks.keys())
+        self._key_idx = list(self.key_landmarks.values())
+        
+        # Separate instance for face crops so its tracking state stays in crop coordinates
+        self.roi_face_mesh = self.mp_face_mesh.FaceMesh(
+            max_num_faces=Config.MAX_NUM_FACES,
+            refine_landmarks=False,  # Iris/lip refinement is unused by the key landmarks
+            min_detection_confidence=Config.DETECTION_CONFIDENCE,
+            min_tracking_confidence=Config.TRACKING_CONFIDENCE
+        )
+        
+        # Per-frame constants, bound once instead of read from Config every frame
+        self._detection_width = Config.DETECTION_WIDTH
+        self._roi_dsize = (Config.ROI_SIZE, Config.ROI_SIZE)
+        self._roi_scale = 1.0 + Config.ROI_EXPANSION
+        
+        # Crop buffers; the face box to crop around is passed in per call
+        self._roi_bgr = np.empty((Config.ROI_SIZE, Config.ROI_SIZE, 3), np.uint8)
+        self._roi_rgb = np.empty_like(self._roi_bgr)
+        
+        # Reusable full-frame buffers at detection resolution, reallocated only on size change
+        self._resized = np.empty((Config.DETECTION_HEIGHT, Config.DETECTION_WIDTH, 3), np.uint8)
+        self._rgb = np.empty_like(self._resized)
+        
+        # [width, height, width] landmark scale for full-frame results, rebuilt on size change
+        self._last_wh: Optional[Tuple[int, int]] = None
+        self._scale: Optional[np.ndarray] = None
     
-    def detect_face_landmarks(self, frame: np.ndarray) -> Optional[Dict]:
+    def detect_face_landmarks(self, frame: np.ndarray, is_rgb: bool = False,
+                              face_box: Optional[Tuple[float, float, float, float]] = None) -> Optional[Dict]:
         """
         Detect face landmarks in the given frame.
         
+        Frames wider than Config.DETECTION_WIDTH are downscaled first; landmark
+        coordinates and 'frame_size' refer to the downscaled frame.
+        
         Args:
-            frame: Input image as numpy array (BGR format)
+            frame: Input image as numpy array (BGR format unless is_rgb)
+            is_rgb: Whether the frame is already in RGB order
+            face_box: Face box (x, y, width, height) returned for the previous
+                frame of the same stream; detection first runs on a crop around it
             
         Returns:
-            Dictionary containing landmark coordinates or None if no face detected
+            Dictionary containing landmark coordinates and the updated
+            'face_box', or None if no face detected
         """
         try:
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame = self._resize_for_detection(frame)
             height, width = frame.shape[:2]
+            face_landmarks = None
             
-            # Process the frame
-            results = self.face_mesh.process(rgb_frame)
+            # Track inside a crop around the last known face first
+            if face_box is not None:
+                roi = self._crop_roi(frame, face_box, is_rgb)
+                if roi is not None:
+                    results = self.roi_face_mesh.process(self._roi_rgb)
+                    if results.multi_face_landmarks:
+                        face_landmarks = results.multi_face_landmarks[0]
+                        origin_x, origin_y, side = roi
+                        # Square crop: one scalar scales x, y and depth alike
+                        point_scale = side
             
-            if not results.multi_face_landmarks:
-                return None
+            # Re-acquire on the full frame when there is no crop or it lost the face
+            if face_landmarks is None:
+                # Convert BGR to RGB for MediaPipe
+                rgb_frame = frame if is_rgb else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+                results = self.face_mesh.process(rgb_frame)
+                
+                if not results.multi_face_landmarks:
+                    return None
+                
+                # Get the first face (we're configured for max 1 face)
+                face_landmarks = results.multi_face_landmarks[0]
+                origin_x = origin_y = 0.0
+                
+                if self._last_wh != (width, height):
+                    # Depth is scaled like x, i.e. relative to face width
+                    self._scale = np.array([width, height, width], dtype=np.float32)
+                    self._last_wh = (width, height)
+                point_scale = self._scale
             
-            # Get the first face (we're configured for max 1 face)
-            face_landmarks = results.multi_face_landmarks[0]
+            # Pull the key landmarks into one (N, 3) array and convert to pixel coordinates
+            points = face_landmarks.landmark
+            key_points = np.array(
+                [(points[idx].x, points[idx].y, points[idx].z) for idx in self._key_idx],
+                dtype=np.float32
+            )
+            key_points *= point_scale
+            if origin_x or origin_y:
+                key_points[:, 0] += origin_x
+                key_points[:, 1] += origin_y
             
-            # Extract key landmarks
-            landmarks = {}
-            for name, idx in self.key_landmarks.items():
-                landmark = face_landmarks.landmark[idx]
-                # Convert normalized coordinates to pixel coordinates
-                landmarks[name] = {
-                    'x': landmark.x * width,
-                    'y': landmark.y * height,
-                    'z': landmark.z * width  # Depth relative to face width
-                }
+            # Keep the per-landmark dictionaries for API compatibility
+            landmarks = {
+                name: {'x': float(x), 'y': float(y), 'z': float(z)}
+                for name, (x, y, z) in zip(self._key_names, key_points.tolist())
+            }
             
-            # Calculate additional derived points
-            landmarks['head_width'] = abs(
-                landmarks['left_temple']['x'] - landmarks['right_temple']['x']
-            )
+            # Head size and rotation in one compiled pass over the key landmarks
+            head_width, head_height, yaw, pitch, roll = head_geometry(key_points)
+            landmarks['head_width'] = head_width
+            landmarks['head_height'] = head_height
+            landmarks['head_rotation'] = {'yaw': yaw, 'pitch': pitch, 'roll': roll}
             
-            landmarks['head_height'] = abs(
-                landmarks['forehead_center']['y'] - landmarks['chin']['y']
+            # Face box for cropping the next frame of this stream
+            _, _, _, _, chin, left_temple, right_temple, top_head = key_points
+            top = float(top_head[1])
+            face_box = (
+                float(min(left_temple[0], right_temple[0])),
+                top,
+                head_width,
+                float(chin[1]) - top
             )
             
-            # Estimate head rotation (basic)
-            landmarks['head_rotation'] = self._estimate_head_rotation(landmarks)
-            
             return {
                 'landmarks': landmarks,
+                'key_points': key_points,
+                'face_box': face_box,
                 'frame_size': {'width': width, 'height': height},
                 'confidence': 1.0  # MediaPipe doesn't provide per-face confidence
             }
@@ -92,48 +161,58 @@ class FaceDetector:
             print(f"Error in face detection: {e}")
             return None
     
-    def _estimate_head_rotation(self, landmarks: Dict) -> Dict[str, float]:
+    def _resize_for_detection(self, frame: np.ndarray) -> np.ndarray:
         """
-        Estimate head rotation angles from landmarks.
+        Downscale the frame to detection width into the reusable buffers.
         
         Args:
-            landmarks: Dictionary of facial landmarks
+            frame: Input image as numpy array
             
         Returns:
-            Dictionary with rotation angles in radians
+            Frame at detection resolution (a view of the reusable buffer when resized)
         """
-        try:
-            # Calculate yaw (left-right rotation) using temple positions
-            left_temple = landmarks['left_temple']
-            right_temple = landmarks['right_temple']
-            
-            # Simple yaw estimation based on temple asymmetry
-            temple_diff = abs(left_temple['x'] - right_temple['x'])
-            expected_width = landmarks['head_width']
-            yaw = np.arctan2(temple_diff - expected_width, expected_width) if expected_width > 0 else 0
-            
-            # Calculate pitch (up-down rotation) using forehead to nose ratio
-            forehead_y = landmarks['forehead_center']['y']
-            nose_y = landmarks['nose_tip']['y']
-            chin_y = landmarks['chin']['y']
-            
-            face_height = abs(forehead_y - chin_y)
-            nose_offset = (nose_y - forehead_y) / face_height if face_height > 0 else 0
-            pitch = np.arctan2(nose_offset - 0.3, 0.7)  # 0.3 is expected nose position ratio
-            
-            # Roll (tilt) using temple height difference
-            temple_height_diff = left_temple['y'] - right_temple['y']
-            roll = np.arctan2(temple_height_diff, landmarks['head_width']) if landmarks['head_width'] > 0 else 0
-            
-            return {
-                'yaw': float(yaw),
-                'pitch': float(pitch),
-                'roll': float(roll)
-            }
+        height, width = frame.shape[:2]
+        if width > self._detection_width:
+            width, height = self._detection_width, int(height * self._detection_width / width)
+        
+        if self._resized.shape[:2] != (height, width):
+            self._resized = np.empty((height, width, 3), np.uint8)
+            self._rgb = np.empty_like(self._resized)
+        
+        if frame.shape[1] == width:
+            return frame
+        return cv2.resize(frame, (width, height), dst=self._resized)
+    
+    def _crop_roi(self, frame: np.ndarray, bbox: Tuple[float, float, float, float],
+                  is_rgb: bool = False) -> Optional[Tuple[float, float, float]]:
+        """
+        Crop a square region around the face box into the ROI buffers.
+        
+        Args:
+            frame: Input image as numpy array (BGR format unless is_rgb)
+            bbox: Face box (x, y, width, height) in pixel coordinates
+            is_rgb: Whether the frame is already in RGB order
             
-        except Exception as e:
-            print(f"Error estimating head rotation: {e}")
-            return {'yaw': 0.0, 'pitch': 0.0, 'roll': 0.0}
+        Returns:
+            (origin_x, origin_y, side) mapping normalized crop coordinates
+            back to the frame, or None if the box is degenerate
+        """
+        x, y, w, h = bbox
+        side = int(max(w, h) * self._roi_scale)
+        if side < 2:
+            return None
+        
+        center_x = x + w / 2
+        center_y = y + h / 2
+        # getRectSubPix puts pixel k's center at k; the face box has it at k + 0.5
+        crop = cv2.getRectSubPix(frame, (side, side), (center_x - 0.5, center_y - 0.5))
+        if is_rgb:
+            cv2.resize(crop, self._roi_dsize, dst=self._roi_rgb)
+        else:
+            cv2.resize(crop, self._roi_dsize, dst=self._roi_bgr)
+            cv2.cvtColor(self._roi_bgr, cv2.COLOR_BGR2RGB, dst=self._roi_rgb)
+        
+        return center_x - side / 2, center_y - side / 2, float(side)
     
     def draw_landmarks(self, frame: np.ndarray, landmarks: Dict) -> np.ndarray:
         """
@@ -144,8 +223,12 @@ class FaceDetector:
             landmarks: Facial landmarks dictionary
             
         Returns:
-            Frame with landmarks drawn
+            Frame with landmarks drawn (the input frame unchanged unless
+            Config.DEBUG_DRAW_LANDMARKS is enabled)
         """
+        if not Config.DEBUG_DRAW_LANDMARKS:
+            return frame
+        
         try:
             frame_copy = frame.copy()
             
@@ -0,0 +1,95 @@
+"""Per-connection frame state: landmark cache and the face box used for cropping."""
+
+import cv2
+import numpy as np
+from typing import Optional, Dict, Tuple
+from config import Config
+
+class FrameCache:
+    """Reuse face landmarks (or the whole response) while frames stay nearly identical."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.last_downsampled_gray: Optional[np.ndarray] = None
+        self.last_landmarks: Optional[Dict] = None
+        self.last_result: Optional[Dict] = None
+        self.frames_since_full_detect = 0
+        # Face box (x, y, width, height) from the last detection, used to crop the next frame
+        self.face_box: Optional[Tuple[float, float, float, float]] = None
+        self.thumbnail_size = (Config.CACHE_THUMBNAIL_SIZE, Config.CACHE_THUMBNAIL_SIZE)
+
+    def thumbnail(self, frame: np.ndarray, is_rgb: bool = False) -> np.ndarray:
+        """
+        Build the small grayscale thumbnail used for motion checks.
+
+        Args:
+            frame: Input image as numpy array (BGR format unless is_rgb)
+            is_rgb: Whether the frame is already in RGB order
+
+        Returns:
+            Grayscale thumbnail
+        """
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY if is_rgb else cv2.COLOR_BGR2GRAY)
+
+    def motion(self, thumbnail: np.ndarray) -> float:
+        """
+        Mean absolute pixel difference against the last fully detected frame.
+
+        Args:
+            thumbnail: Thumbnail of the current frame
+
+        Returns:
+            Motion score (infinity when there is nothing to compare against)
+        """
+        if self.last_downsampled_gray is None:
+            return float('inf')
+        return float(cv2.absdiff(thumbnail, self.last_downsampled_gray).mean())
+
+    def get_result(self, motion: float) -> Optional[Dict]:
+        """
+        Return the previous response if the frame is static enough to skip all work.
+
+        Args:
+            motion: Motion score from `motion`
+
+        Returns:
+            Cached response dictionary or None if the frame must be processed
+        """
+        if (self.last_result is None
+                or motion >= Config.CACHE_STATIC_THRESHOLD
+                or self.frames_since_full_detect >= Config.CACHE_MAX_REUSE_FRAMES):
+            return None
+
+        self.frames_since_full_detect += 1
+        return self.last_result
+
+    def get_landmarks(self, motion: float) -> Optional[Dict]:
+        """
+        Return cached landmarks if the current frame may reuse them.
+
+        Args:
+            motion: Motion score from `motion`
+
+        Returns:
+            Cached landmarks dictionary or None if a full detection is needed
+        """
+        if (self.last_landmarks is None
+                or motion >= Config.CACHE_MOTION_THRESHOLD
+                or self.frames_since_full_detect >= Config.CACHE_MAX_REUSE_FRAMES):
+            return None
+
+        self.frames_since_full_detect += 1
+        return self.last_landmarks
+
+    def update(self, thumbnail: np.ndarray, landmarks: Optional[Dict]):
+        """Store the result of a full detection."""
+        self.last_downsampled_gray = thumbnail
+        self.last_landmarks = landmarks
+        self.face_box = landmarks['face_box'] if landmarks is not None else None
+        self.last_result = None
+        self.frames_since_full_detect = 0
+
+    def store_result(self, result: Dict):
+        """Remember the response sent for the current frame."""
+        self.last_result = result
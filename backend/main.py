@@ -1,18 +1,20 @@
 """FastAPI main application with WebSocket support for Virtual Hat Try-On."""
 
 import asyncio
-import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
-import numpy as np
-from io import BytesIO
-from PIL import Image
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from config import Config
 from face_detector import FaceDetector
+from frame_cache import FrameCache
 from pose_calculator import PoseCalculator
+from utils import decode_frame
 
 app = FastAPI(title="Virtual Hat Try-On Backend", version="1.0.0")
 
@@ -25,9 +27,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize face detection and pose calculation
+# Initialize face detection; pose smoothing is per connection
 face_detector = FaceDetector()
-pose_calculator = PoseCalculator()
+
+# Frames are processed off the event loop; OpenCV and MediaPipe release the GIL.
+# Keep OpenCV single-threaded so it doesn't oversubscribe cores against the pool.
+cv2.setNumThreads(1)
+_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# The shared detector keeps MediaPipe tracking state and is not thread-safe
+_pipeline_lock = threading.Lock()
 
 class ConnectionManager:
     """Manages WebSocket connections."""
@@ -47,48 +56,63 @@ class ConnectionManager:
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         try:
-            await websocket.send_text(json.dumps(message))
+            # Compact UTF-8 JSON sent as a binary frame; the client decodes it
+            await websocket.send_bytes(orjson.dumps(message))
         except Exception as e:
             print(f"Error sending message: {e}")
 
 manager = ConnectionManager()
 
-def process_frame(frame_bytes: bytes) -> dict:
+def process_frame(frame_bytes: bytes, cache: FrameCache, pose_calculator: PoseCalculator) -> dict:
     """Process a single frame and return hat positioning data."""
     try:
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(frame_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # Decode JPEG or raw RGB/YUV frame
+        frame, is_rgb = decode_frame(frame_bytes)
         
         if frame is None:
             return {"face_detected": False, "error": "Invalid frame"}
         
-        # Resize frame for processing if needed
-        height, width = frame.shape[:2]
-        if width > Config.DETECTION_WIDTH:
-            scale = Config.DETECTION_WIDTH / width
-            new_width = int(width * scale)
-            new_height = int(height * scale)
-            frame = cv2.resize(frame, (new_width, new_height))
+        # Resend the previous result outright for a static scene
+        thumbnail = cache.thumbnail(frame, is_rgb)
+        motion = cache.motion(thumbnail)
+        result = cache.get_result(motion)
+        if result is not None:
+            return result
         
-        # Detect face landmarks
-        landmarks = face_detector.detect_face_landmarks(frame)
+        # Reuse cached landmarks when the scene has barely changed
+        landmarks = cache.get_landmarks(motion)
         
         if landmarks is None:
-            return {"face_detected": False}
+            # Detect face landmarks
+            with _pipeline_lock:
+                landmarks = face_detector.detect_face_landmarks(frame, is_rgb, cache.face_box)
+            cache.update(thumbnail, landmarks)
+            
+            # Avoid smoothing across large jumps or lost tracking
+            if landmarks is None or motion > Config.CACHE_RESET_THRESHOLD:
+                pose_calculator.reset_smoothing()
         
-        # Calculate hat position
-        hat_pose = pose_calculator.calculate_hat_pose(landmarks, frame.shape)
+        if landmarks is None:
+            result = {"face_detected": False}
+        else:
+            # Calculate hat position in the detector's (downscaled) frame
+            frame_size = landmarks['frame_size']
+            hat_pose = pose_calculator.calculate_hat_pose(
+                landmarks, (frame_size['height'], frame_size['width'])
+            )
+            
+            result = {
+                "face_detected": True,
+                "hat": {
+                    "position": hat_pose["position"],
+                    "rotation": hat_pose["rotation"],
+                    "scale": hat_pose["scale"]
+                },
+                "frame_size": frame_size
+            }
         
-        return {
-            "face_detected": True,
-            "hat": {
-                "position": hat_pose["position"],
-                "rotation": hat_pose["rotation"],
-                "scale": hat_pose["scale"]
-            },
-            "frame_size": {"width": frame.shape[1], "height": frame.shape[0]}
-        }
+        cache.store_result(result)
+        return result
         
     except Exception as e:
         print(f"Error processing frame: {e}")
@@ -117,17 +141,40 @@ async def health_check():
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time frame processing."""
     await manager.connect(websocket)
+    cache = FrameCache()
+    pose_calculator = PoseCalculator()
+    loop = asyncio.get_running_loop()
     
-    try:
+    # Holds only the newest unprocessed frame; older ones are dropped
+    frames: asyncio.Queue = asyncio.Queue(maxsize=1)
+    
+    async def receive_frames():
         while True:
             # Receive frame data as bytes
             data = await websocket.receive_bytes()
             
-            # Process the frame
-            result = process_frame(data)
+            # Replace a frame the worker hasn't picked up yet
+            if frames.full():
+                frames.get_nowait()
+            frames.put_nowait(data)
+    
+    async def process_frames():
+        while True:
+            data = await frames.get()
+            
+            # Process the frame on the worker pool
+            result = await loop.run_in_executor(_pool, process_frame, data, cache, pose_calculator)
             
             # Send result back to client
             await manager.send_personal_message(result, websocket)
+    
+    recv_task = asyncio.create_task(receive_frames())
+    work_task = asyncio.create_task(process_frames())
+    
+    try:
+        done, _ = await asyncio.wait({recv_task, work_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -135,13 +182,31 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         print(f"WebSocket error: {e}")
         manager.disconnect(websocket)
+    finally:
+        recv_task.cancel()
+        work_task.cancel()
 
 if __name__ == "__main__":
+    # Faster event loop and HTTP parser when available (uvloop is not supported on Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+    
     print(f"Starting Virtual Hat Try-On Backend on {Config.HOST}:{Config.PORT}")
     uvicorn.run(
         "main:app",
         host=Config.HOST,
         port=Config.PORT,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+        reload=Config.RELOAD,
+        loop=loop_impl,
+        http=http_impl,
+        log_level="warning"
+    )
@@ -1,16 +1,25 @@
 """Hat positioning calculation based on facial landmarks."""
 
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from config import Config
+from _kernels import compute_pose
 
 class PoseCalculator:
     """Calculate 3D hat positioning based on facial landmarks."""
     
     def __init__(self):
         """Initialize pose calculator with smoothing filter."""
-        self.previous_pose = None
+        # Previous smoothed pose packed as (pos x, y, z, rot x, y, z, scale)
+        self._prev_vec: Optional[np.ndarray] = None
         self.smoothing_factor = Config.SMOOTHING_FACTOR
+        
+        # Per-frame constants, bound once instead of read from Config every frame
+        self._one_minus_alpha = 1.0 - self.smoothing_factor
+        self._offset_z = Config.HAT_OFFSET_Z
+        # Balanced reference head width (px) for modern webcam resolutions
+        self._ref_width_inv = 1.0 / 120.0
+        self._scale_per_px = self._ref_width_inv * Config.HAT_SCALE_FACTOR
     
     def calculate_hat_pose(self, landmarks_data: Dict, frame_shape: Tuple[int, int]) -> Dict:
         """
@@ -24,139 +33,38 @@ class PoseCalculator:
             Dictionary with hat pose information
         """
         try:
-            landmarks = landmarks_data['landmarks']
+            key_points = landmarks_data['key_points']
             frame_height, frame_width = frame_shape[:2]
             
-            # Calculate hat position (center above forehead)
-            position = self._calculate_hat_position(landmarks, frame_width, frame_height)
-            
-            # Calculate hat rotation based on head orientation
-            rotation = self._calculate_hat_rotation(landmarks)
-            
-            # Calculate hat scale based on head size
-            scale = self._calculate_hat_scale(landmarks)
-            
-            # Create pose dictionary
-            pose = {
-                'position': position,
-                'rotation': rotation,
-                'scale': scale
-            }
+            # Position, rotation and scale in one compiled pass
+            pose_vec = compute_pose(
+                key_points, frame_width, frame_height, self._scale_per_px, self._offset_z
+            )
             
             # Apply smoothing if we have previous pose data
-            if self.previous_pose is not None:
-                pose = self._apply_smoothing(pose, self.previous_pose)
+            if self._prev_vec is not None:
+                pose_vec = self._apply_smoothing(pose_vec, self._prev_vec)
             
-            self.previous_pose = pose.copy()
+            self._prev_vec = pose_vec
             
-            return pose
+            return self._vec_to_pose(pose_vec)
             
         except Exception as e:
             print(f"Error calculating hat pose: {e}")
             return self._get_default_pose()
     
-    def _calculate_hat_position(self, landmarks: Dict, frame_width: int, frame_height: int) -> Dict[str, float]:
-        """Calculate hat position in normalized coordinates (0-1 range)."""
-        try:
-            # Get forehead center as the base position
-            forehead = landmarks['forehead_center']
-            head_height = landmarks['head_height']
-            
-            # Calculate position on top of head (not above forehead)
-            # Use a percentage of head height to position hat correctly on the crown
-            hat_x = forehead['x'] / frame_width
-            
-            # Position hat on top of head: move up by a fraction of head height from forehead
-            crown_offset = head_height * 0.4  # 40% of head height up from forehead to crown
-            hat_y = (forehead['y'] - crown_offset) / frame_height
-            hat_z = Config.HAT_OFFSET_Z  # Fixed depth offset
-            
-            # Clamp values to reasonable ranges
-            hat_x = np.clip(hat_x, 0.0, 1.0)
-            hat_y = np.clip(hat_y, 0.0, 1.0)
-            
-            return {
-                'x': float(hat_x),
-                'y': float(hat_y), 
-                'z': float(hat_z)
-            }
-            
-        except Exception as e:
-            print(f"Error calculating hat position: {e}")
-            return {'x': 0.5, 'y': 0.3, 'z': 0.0}
-    
-    def _calculate_hat_rotation(self, landmarks: Dict) -> Dict[str, float]:
-        """Calculate hat rotation to match head orientation."""
-        try:
-            head_rotation = landmarks['head_rotation']
-            
-            # Hat should follow head rotation
-            # Apply some damping to make it look more natural
-            rotation = {
-                'x': float(head_rotation['pitch'] * 0.8),  # Slightly less pitch
-                'y': float(head_rotation['yaw'] * 0.9),    # Follow yaw closely
-                'z': float(head_rotation['roll'] * 0.7)    # Less roll for stability
-            }
-            
-            return rotation
-            
-        except Exception as e:
-            print(f"Error calculating hat rotation: {e}")
-            return {'x': 0.0, 'y': 0.0, 'z': 0.0}
-    
-    def _calculate_hat_scale(self, landmarks: Dict) -> float:
-        """Calculate hat scale based on head size."""
-        try:
-            # Base scale on head width
-            head_width = landmarks['head_width']
-            
-            # Balanced reference width for modern webcam resolutions
-            reference_width = 120.0  # Balanced value between 100 and 150
-            scale = (head_width / reference_width) * Config.HAT_SCALE_FACTOR
-            
-            # Expanded scale range for better flexibility
-            scale = np.clip(scale, 0.5, 4.0)  # Increased max from 2.0 to 4.0
-            
-            return float(scale)
-            
-        except Exception as e:
-            print(f"Error calculating hat scale: {e}")
-            return 1.5  # Increased default from 1.0
-    
-    def _apply_smoothing(self, current_pose: Dict, previous_pose: Dict) -> Dict:
+    def _apply_smoothing(self, current_vec: np.ndarray, previous_vec: np.ndarray) -> np.ndarray:
         """Apply temporal smoothing to reduce jitter."""
-        try:
-            smoothed_pose = {}
-            
-            # Smooth position
-            smoothed_pose['position'] = {}
-            for axis in ['x', 'y', 'z']:
-                current_val = current_pose['position'][axis]
-                previous_val = previous_pose['position'][axis]
-                smoothed_val = (self.smoothing_factor * previous_val + 
-                              (1 - self.smoothing_factor) * current_val)
-                smoothed_pose['position'][axis] = smoothed_val
-            
-            # Smooth rotation
-            smoothed_pose['rotation'] = {}
-            for axis in ['x', 'y', 'z']:
-                current_val = current_pose['rotation'][axis]
-                previous_val = previous_pose['rotation'][axis]
-                smoothed_val = (self.smoothing_factor * previous_val + 
-                              (1 - self.smoothing_factor) * current_val)
-                smoothed_pose['rotation'][axis] = smoothed_val
-            
-            # Smooth scale
-            current_scale = current_pose['scale']
-            previous_scale = previous_pose['scale']
-            smoothed_pose['scale'] = (self.smoothing_factor * previous_scale + 
-                                    (1 - self.smoothing_factor) * current_scale)
-            
-            return smoothed_pose
-            
-        except Exception as e:
-            print(f"Error applying smoothing: {e}")
-            return current_pose
+        return self.smoothing_factor * previous_vec + self._one_minus_alpha * current_vec
+    
+    def _vec_to_pose(self, pose_vec: np.ndarray) -> Dict:
+        """Unpack a (pos x, y, z, rot x, y, z, scale) vector into the pose dictionary."""
+        px, py, pz, rx, ry, rz, scale = pose_vec.tolist()
+        return {
+            'position': {'x': px, 'y': py, 'z': pz},
+            'rotation': {'x': rx, 'y': ry, 'z': rz},
+            'scale': scale
+        }
     
     def _get_default_pose(self) -> Dict:
         """Return default hat pose when calculation fails."""
@@ -168,7 +76,7 @@ class PoseCalculator:
     
     def reset_smoothing(self):
         """Reset smoothing filter (useful when face tracking is lost and regained)."""
-        self.previous_pose = None
+        self._prev_vec = None
     
     def get_bounding_box(self, landmarks: Dict) -> Dict[str, float]:
         """
@@ -180,22 +88,17 @@ class PoseCalculator:
         Returns:
             Bounding box coordinates
         """
-        try:
-            # Get extreme points
-            left = landmarks['left_temple']['x']
-            right = landmarks['right_temple']['x']
-            top = landmarks['forehead_center']['y']
-            bottom = landmarks['chin']['y']
-            
-            return {
-                'left': float(left),
-                'right': float(right),
-                'top': float(top),
-                'bottom': float(bottom),
-                'width': float(right - left),
-                'height': float(bottom - top)
-            }
-            
-        except Exception as e:
-            print(f"Error calculating bounding box: {e}")
-            return {'left': 0, 'right': 100, 'top': 0, 'bottom': 100, 'width': 100, 'height': 100}
\ No newline at end of file
+        # Get extreme points
+        left = landmarks['left_temple']['x']
+        right = landmarks['right_temple']['x']
+        top = landmarks['forehead_center']['y']
+        bottom = landmarks['chin']['y']
+        
+        return {
+            'left': float(left),
+            'right': float(right),
+            'top': float(top),
+            'bottom': float(bottom),
+            'width': float(right - left),
+            'height': float(bottom - top)
+        }
\ No newline at end of file
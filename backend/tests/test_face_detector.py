@@ -0,0 +1,67 @@
+"""Tests for mapping face crop landmarks back to frame coordinates."""
+
+import importlib.util
+import sys
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+# FaceDetector only reaches MediaPipe through mp.solutions, which the tests replace
+if importlib.util.find_spec('mediapipe') is None:
+    sys.modules['mediapipe'] = SimpleNamespace(solutions=None)
+
+import face_detector
+from face_detector import FaceDetector
+
+WIDTH, HEIGHT = 320, 240
+
+class StubFaceMesh:
+    """Face mesh stand-in that puts every landmark on the centroid of the bright pixels."""
+    
+    def __init__(self, **kwargs):
+        pass
+    
+    def process(self, rgb):
+        weights = rgb[..., 0].astype(np.float64)
+        ys, xs = np.indices(weights.shape)
+        total = weights.sum()
+        if total == 0:
+            return SimpleNamespace(multi_face_landmarks=None)
+        
+        # MediaPipe normalizes by image size with pixel k spanning [k, k + 1)
+        height, width = weights.shape
+        x = ((xs * weights).sum() / total + 0.5) / width
+        y = ((ys * weights).sum() / total + 0.5) / height
+        point = SimpleNamespace(x=x, y=y, z=0.0)
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=[point] * 468)])
+
+@pytest.fixture
+def detector(monkeypatch):
+    solutions = SimpleNamespace(
+        face_mesh=SimpleNamespace(FaceMesh=StubFaceMesh),
+        drawing_utils=None,
+        drawing_styles=None
+    )
+    monkeypatch.setattr(face_detector, 'mp', SimpleNamespace(solutions=solutions))
+    return FaceDetector()
+
+def _marker_frame(center_x, center_y):
+    """Black BGR frame with a 9x9 white square centered on the given pixel index."""
+    frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+    frame[center_y - 4:center_y + 5, center_x - 4:center_x + 5] = 255
+    return frame
+
+@pytest.mark.parametrize('face_box', [
+    (180.0, 95.0, 50.0, 50.0),
+    (170.3, 80.7, 61.0, 73.0),
+    (190.0, 100.0, 30.0, 45.0),
+])
+def test_crop_landmarks_match_full_frame(detector, face_box):
+    frame = _marker_frame(204, 120)
+    
+    full = detector.detect_face_landmarks(frame)
+    crop = detector.detect_face_landmarks(frame, face_box=face_box)
+    
+    # The marker covers pixels 200..208, so its center is at 204.5 in corner coordinates
+    np.testing.assert_allclose(full['key_points'][0, :2], (204.5, 120.5), atol=1e-4)
+    np.testing.assert_allclose(crop['key_points'][:, :2], full['key_points'][:, :2], atol=0.05)
@@ -0,0 +1,82 @@
+"""Tests for the per-connection frame cache."""
+
+import numpy as np
+import pytest
+from config import Config
+from frame_cache import FrameCache
+
+def _step(cache, thumbnail):
+    """Run the cache decisions of main.process_frame and report which path was taken."""
+    motion = cache.motion(thumbnail)
+    if cache.get_result(motion) is not None:
+        return 'result'
+    if cache.get_landmarks(motion) is not None:
+        return 'landmarks'
+    cache.update(thumbnail, {'face_box': (0.0, 0.0, 10.0, 10.0)})
+    cache.store_result({'face_detected': True})
+    return 'detect'
+
+def _thumbnail(shift=0):
+    """Thumbnail with `shift` added to half of its pixels (motion score shift / 2)."""
+    size = Config.CACHE_THUMBNAIL_SIZE
+    thumbnail = np.full((size, size), 100, np.uint8)
+    thumbnail[:size // 2] += shift
+    return thumbnail
+
+def test_thumbnail_shape():
+    frame = np.zeros((48, 64, 3), np.uint8)
+    thumbnail = FrameCache().thumbnail(frame)
+    
+    assert thumbnail.shape == (Config.CACHE_THUMBNAIL_SIZE, Config.CACHE_THUMBNAIL_SIZE)
+    assert thumbnail.dtype == np.uint8
+
+def test_first_frame_detects():
+    cache = FrameCache()
+    
+    assert cache.motion(_thumbnail()) == float('inf')
+    assert _step(cache, _thumbnail()) == 'detect'
+
+def test_resends_result_for_static_frames():
+    cache = FrameCache()
+    _step(cache, _thumbnail())
+    
+    assert _step(cache, _thumbnail()) == 'result'
+
+def test_reuses_landmarks_for_small_motion():
+    cache = FrameCache()
+    _step(cache, _thumbnail())
+    
+    # Between the static and motion thresholds
+    shift = 3
+    assert Config.CACHE_STATIC_THRESHOLD <= shift / 2 < Config.CACHE_MOTION_THRESHOLD
+    assert _step(cache, _thumbnail(shift)) == 'landmarks'
+
+def test_detects_on_large_motion():
+    cache = FrameCache()
+    _step(cache, _thumbnail())
+    
+    assert _step(cache, _thumbnail(50)) == 'detect'
+
+@pytest.mark.parametrize('shift, reuse_path', [(0, 'result'), (3, 'landmarks')])
+def test_forces_detection_after_max_reuse(shift, reuse_path):
+    cache = FrameCache()
+    _step(cache, _thumbnail())
+    
+    paths = [_step(cache, _thumbnail(shift)) for _ in range(Config.CACHE_MAX_REUSE_FRAMES + 1)]
+    
+    assert paths == [reuse_path] * Config.CACHE_MAX_REUSE_FRAMES + ['detect']
+
+def test_tracks_face_box_per_cache():
+    cache, other = FrameCache(), FrameCache()
+    _step(cache, _thumbnail())
+    
+    assert cache.face_box == (0.0, 0.0, 10.0, 10.0)
+    assert other.face_box is None
+
+def test_drops_face_box_when_face_lost():
+    cache = FrameCache()
+    _step(cache, _thumbnail())
+    cache.update(_thumbnail(), None)
+    
+    assert cache.face_box is None
+    assert cache.get_landmarks(0.0) is None
@@ -0,0 +1,134 @@
+"""Tests for the compiled pose kernels against the dictionary math they replaced."""
+
+import numpy as np
+import pytest
+from config import Config
+from _kernels import compute_pose, head_geometry
+from pose_calculator import PoseCalculator
+
+KEY_NAMES = [
+    'forehead_center', 'forehead_left', 'forehead_right', 'nose_tip',
+    'chin', 'left_temple', 'right_temple', 'top_head'
+]
+SCALE_PER_PX = Config.HAT_SCALE_FACTOR / 120.0
+
+def _random_key_points(rng, center_x=160.0, center_y=140.0, width=60.0):
+    """Key landmarks of a roughly upright face with random jitter."""
+    key_points = np.array([
+        [0, -40, 0], [-10, -40, 0], [10, -40, 0], [0, 0, -10],
+        [0, 50, 0], [-width / 2, -20, 5], [width / 2, -20, 5], [0, -60, 0]
+    ], dtype=np.float64)
+    key_points[:, :2] += (center_x, center_y)
+    key_points += rng.normal(0, 4, key_points.shape)
+    return key_points.astype(np.float32)
+
+def _landmarks_reference(key_points):
+    """Landmark dictionary as FaceDetector built it before the kernels."""
+    landmarks = {
+        name: {'x': float(x), 'y': float(y), 'z': float(z)}
+        for name, (x, y, z) in zip(KEY_NAMES, key_points.tolist())
+    }
+    landmarks['head_width'] = abs(landmarks['left_temple']['x'] - landmarks['right_temple']['x'])
+    landmarks['head_height'] = abs(landmarks['forehead_center']['y'] - landmarks['chin']['y'])
+    
+    left_temple = landmarks['left_temple']
+    right_temple = landmarks['right_temple']
+    temple_diff = abs(left_temple['x'] - right_temple['x'])
+    expected_width = landmarks['head_width']
+    yaw = np.arctan2(temple_diff - expected_width, expected_width) if expected_width > 0 else 0
+    
+    forehead_y = landmarks['forehead_center']['y']
+    nose_y = landmarks['nose_tip']['y']
+    face_height = abs(forehead_y - landmarks['chin']['y'])
+    nose_offset = (nose_y - forehead_y) / face_height if face_height > 0 else 0
+    pitch = np.arctan2(nose_offset - 0.3, 0.7)
+    
+    temple_height_diff = left_temple['y'] - right_temple['y']
+    roll = np.arctan2(temple_height_diff, expected_width) if expected_width > 0 else 0
+    
+    landmarks['head_rotation'] = {'yaw': float(yaw), 'pitch': float(pitch), 'roll': float(roll)}
+    return landmarks
+
+def _pose_reference(landmarks, frame_width, frame_height):
+    """Raw (pos x, y, z, rot x, y, z, scale) as PoseCalculator computed it before the kernels."""
+    forehead = landmarks['forehead_center']
+    rotation = landmarks['head_rotation']
+    crown_offset = landmarks['head_height'] * 0.4
+    scale = (landmarks['head_width'] / 120.0) * Config.HAT_SCALE_FACTOR
+    return np.array([
+        np.clip(forehead['x'] / frame_width, 0.0, 1.0),
+        np.clip((forehead['y'] - crown_offset) / frame_height, 0.0, 1.0),
+        Config.HAT_OFFSET_Z,
+        rotation['pitch'] * 0.8,
+        rotation['yaw'] * 0.9,
+        rotation['roll'] * 0.7,
+        np.clip(scale, 0.5, 4.0)
+    ])
+
+@pytest.mark.parametrize('frame_width, frame_height', [(320, 240), (640, 480), (160, 120)])
+def test_compute_pose_matches_dict_math(frame_width, frame_height):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        key_points = _random_key_points(
+            rng,
+            center_x=rng.uniform(0, frame_width),
+            center_y=rng.uniform(0, frame_height),
+            width=rng.uniform(20, 200)
+        )
+        
+        pose = compute_pose(key_points, frame_width, frame_height, SCALE_PER_PX, Config.HAT_OFFSET_Z)
+        
+        expected = _pose_reference(_landmarks_reference(key_points), frame_width, frame_height)
+        np.testing.assert_allclose(pose, expected, atol=1e-5)
+
+@pytest.mark.parametrize('center_x, center_y, width', [
+    (-40.0, 140.0, 60.0),    # forehead left of the frame
+    (360.0, 140.0, 60.0),    # forehead right of the frame
+    (160.0, 10.0, 60.0),     # crown above the frame
+    (160.0, 340.0, 60.0),    # forehead below the frame
+    (160.0, 140.0, 10.0),    # tiny head, minimum scale
+    (160.0, 140.0, 500.0),   # huge head, maximum scale
+])
+def test_compute_pose_clamps_like_dict_math(center_x, center_y, width):
+    key_points = _random_key_points(np.random.default_rng(1), center_x, center_y, width)
+    
+    pose = compute_pose(key_points, 320, 240, SCALE_PER_PX, Config.HAT_OFFSET_Z)
+    
+    np.testing.assert_allclose(pose, _pose_reference(_landmarks_reference(key_points), 320, 240), atol=1e-5)
+    assert 0.0 <= pose[0] <= 1.0 and 0.0 <= pose[1] <= 1.0
+    assert 0.5 <= pose[6] <= 4.0
+
+def test_calculate_hat_pose_matches_dict_math():
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        key_points = _random_key_points(rng, width=rng.uniform(20, 200))
+        
+        pose = PoseCalculator().calculate_hat_pose({'key_points': key_points}, (240, 320))
+        
+        px, py, pz, rx, ry, rz, scale = _pose_reference(_landmarks_reference(key_points), 320, 240)
+        np.testing.assert_allclose(
+            [*pose['position'].values(), *pose['rotation'].values(), pose['scale']],
+            [px, py, pz, rx, ry, rz, scale],
+            atol=1e-5
+        )
+
+def _geometry_reference(key_points):
+    landmarks = _landmarks_reference(key_points)
+    rotation = landmarks['head_rotation']
+    return [
+        landmarks['head_width'], landmarks['head_height'],
+        rotation['yaw'], rotation['pitch'], rotation['roll']
+    ]
+
+def test_head_geometry_matches_dict_math():
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        key_points = _random_key_points(rng, width=rng.uniform(20, 200))
+        
+        np.testing.assert_allclose(head_geometry(key_points), _geometry_reference(key_points), atol=1e-5)
+
+def test_head_geometry_degenerate_face():
+    # All landmarks on one point: zero width and height must not divide by zero
+    key_points = np.full((8, 3), 50.0, dtype=np.float32)
+    
+    np.testing.assert_allclose(head_geometry(key_points), _geometry_reference(key_points))
@@ -0,0 +1,66 @@
+"""Tests for the hat pose smoothing in PoseCalculator."""
+
+import numpy as np
+import pytest
+from config import Config
+from pose_calculator import PoseCalculator
+
+def _landmarks_data(shift_x=0.0, spread=60.0):
+    """Key landmarks of an upright face centered near (160 + shift_x, 140)."""
+    key_points = np.array([
+        [160, 100, 0],                  # forehead_center
+        [150, 100, 0],                  # forehead_left
+        [170, 100, 0],                  # forehead_right
+        [160, 140, -10],                # nose_tip
+        [160, 190, 0],                  # chin
+        [160 - spread / 2, 120, 5],     # left_temple
+        [160 + spread / 2, 124, 5],     # right_temple
+        [160, 80, 0],                   # top_head
+    ], dtype=np.float32)
+    key_points[:, 0] += shift_x
+    return {'key_points': key_points}
+
+def _smooth_reference(current, previous, alpha):
+    """Per-axis dictionary EMA the vector form replaced."""
+    smoothed = {}
+    for part in ('position', 'rotation'):
+        smoothed[part] = {
+            axis: alpha * previous[part][axis] + (1 - alpha) * current[part][axis]
+            for axis in ('x', 'y', 'z')
+        }
+    smoothed['scale'] = alpha * previous['scale'] + (1 - alpha) * current['scale']
+    return smoothed
+
+def _raw_pose(landmarks_data):
+    """Unsmoothed pose from a fresh calculator."""
+    return PoseCalculator().calculate_hat_pose(landmarks_data, (240, 320))
+
+def _assert_pose_close(actual, expected):
+    for part in ('position', 'rotation'):
+        for axis in ('x', 'y', 'z'):
+            assert actual[part][axis] == pytest.approx(expected[part][axis], abs=1e-12)
+    assert actual['scale'] == pytest.approx(expected['scale'], abs=1e-12)
+
+def test_smoothing_matches_dict_ema():
+    frames = [_landmarks_data(shift, spread) for shift, spread in ((0, 60), (12, 70), (-8, 55), (3, 90))]
+    calculator = PoseCalculator()
+    
+    expected = None
+    for landmarks_data in frames:
+        raw = _raw_pose(landmarks_data)
+        expected = raw if expected is None else _smooth_reference(raw, expected, Config.SMOOTHING_FACTOR)
+        _assert_pose_close(calculator.calculate_hat_pose(landmarks_data, (240, 320)), expected)
+
+def test_reset_smoothing_restarts_from_raw_pose():
+    calculator = PoseCalculator()
+    calculator.calculate_hat_pose(_landmarks_data(), (240, 320))
+    calculator.reset_smoothing()
+    
+    landmarks_data = _landmarks_data(20, 80)
+    _assert_pose_close(calculator.calculate_hat_pose(landmarks_data, (240, 320)), _raw_pose(landmarks_data))
+
+def test_pose_values_are_python_floats():
+    pose = PoseCalculator().calculate_hat_pose(_landmarks_data(), (240, 320))
+    
+    values = list(pose['position'].values()) + list(pose['rotation'].values()) + [pose['scale']]
+    assert all(type(value) is float for value in values)
@@ -0,0 +1,175 @@
+"""Tests for the helper utilities."""
+
+import cv2
+import numpy as np
+import pytest
+from utils import (
+    FRAME_HEADER, FRAME_FORMAT_RGB, FRAME_FORMAT_YUV420, decode_frame,
+    angle_difference, angle_difference_batch, create_rotation_matrix,
+    denormalize_coordinates, denormalize_coordinates_batch,
+    normalize_coordinates, normalize_coordinates_batch
+)
+
+WIDTH, HEIGHT = 64, 48
+
+@pytest.fixture
+def bgr_frame():
+    """Smooth gradient frame that survives JPEG and I420 round trips closely."""
+    x = np.linspace(0, 255, WIDTH, dtype=np.float32)
+    y = np.linspace(0, 255, HEIGHT, dtype=np.float32)
+    frame = np.empty((HEIGHT, WIDTH, 3), np.uint8)
+    frame[..., 0] = x[None, :]
+    frame[..., 1] = y[:, None]
+    frame[..., 2] = 128
+    return frame
+
+def test_decode_jpeg(bgr_frame):
+    jpeg = cv2.imencode('.jpg', bgr_frame)[1].tobytes()
+    frame, is_rgb = decode_frame(jpeg)
+    
+    assert not is_rgb
+    assert frame.shape == (HEIGHT, WIDTH, 3)
+    assert np.abs(frame.astype(int) - bgr_frame).mean() < 3
+
+def test_decode_rgb(bgr_frame):
+    rgb = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+    frame, is_rgb = decode_frame(FRAME_HEADER.pack(WIDTH, HEIGHT, FRAME_FORMAT_RGB) + rgb.tobytes())
+    
+    assert is_rgb
+    np.testing.assert_array_equal(frame, rgb)
+
+def test_decode_i420(bgr_frame):
+    yuv = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2YUV_I420)
+    frame, is_rgb = decode_frame(FRAME_HEADER.pack(WIDTH, HEIGHT, FRAME_FORMAT_YUV420) + yuv.tobytes())
+    
+    assert is_rgb
+    assert frame.shape == (HEIGHT, WIDTH, 3)
+    rgb = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+    assert np.abs(frame.astype(int) - rgb).mean() < 3
+
+@pytest.mark.parametrize('frame_format, bytes_per_pixel', [
+    (FRAME_FORMAT_RGB, 3),
+    (FRAME_FORMAT_YUV420, 1.5),
+])
+def test_decode_truncated_payload(frame_format, bytes_per_pixel):
+    payload = bytes(int(WIDTH * HEIGHT * bytes_per_pixel) - 1)
+    
+    assert decode_frame(FRAME_HEADER.pack(WIDTH, HEIGHT, frame_format) + payload) == (None, False)
+
+def test_decode_truncated_header():
+    assert decode_frame(b'\x01\x02\x03') == (None, False)
+
+def test_decode_i420_odd_size():
+    width, height = WIDTH + 1, HEIGHT
+    payload = bytes(width * height * 3 // 2)
+    
+    assert decode_frame(FRAME_HEADER.pack(width, height, FRAME_FORMAT_YUV420) + payload) == (None, False)
+
+def test_decode_unknown_format():
+    payload = bytes(WIDTH * HEIGHT * 3)
+    
+    assert decode_frame(FRAME_HEADER.pack(WIDTH, HEIGHT, 7) + payload) == (None, False)
+
+@pytest.mark.parametrize('extension', ['.png', '.bmp', '.webp'])
+def test_decode_falls_back_to_imdecode(bgr_frame, extension):
+    if not cv2.haveImageWriter(extension):
+        pytest.skip(f'OpenCV build cannot encode {extension}')
+    encoded = cv2.imencode(extension, bgr_frame)[1].tobytes()
+    frame, is_rgb = decode_frame(encoded)
+    
+    assert not is_rgb
+    assert frame.shape == (HEIGHT, WIDTH, 3)
+    assert np.abs(frame.astype(int) - bgr_frame).mean() < 3
+
+def test_decode_empty_payload():
+    assert decode_frame(b'') == (None, False)
+
+
+def _rotation_matrix_reference(yaw, pitch, roll):
+    """Rz(yaw) @ Ry(pitch) @ Rx(roll) built from the individual axis rotations."""
+    Rz = np.array([
+        [np.cos(yaw), -np.sin(yaw), 0],
+        [np.sin(yaw), np.cos(yaw), 0],
+        [0, 0, 1]
+    ])
+    Ry = np.array([
+        [np.cos(pitch), 0, np.sin(pitch)],
+        [0, 1, 0],
+        [-np.sin(pitch), 0, np.cos(pitch)]
+    ])
+    Rx = np.array([
+        [1, 0, 0],
+        [0, np.cos(roll), -np.sin(roll)],
+        [0, np.sin(roll), np.cos(roll)]
+    ])
+    return Rz @ Ry @ Rx
+
+def test_rotation_matrix_matches_axis_product():
+    rng = np.random.default_rng(0)
+    for yaw, pitch, roll in rng.uniform(-np.pi, np.pi, (100, 3)):
+        np.testing.assert_allclose(
+            create_rotation_matrix(yaw, pitch, roll),
+            _rotation_matrix_reference(yaw, pitch, roll),
+            atol=1e-12
+        )
+
+def _angle_difference_reference(angle1, angle2):
+    """Loop-based wrap of angle2 - angle1 into [-π, π]."""
+    diff = angle2 - angle1
+    while diff > np.pi:
+        diff -= 2 * np.pi
+    while diff < -np.pi:
+        diff += 2 * np.pi
+    return diff
+
+def test_angle_difference_matches_loop():
+    rng = np.random.default_rng(0)
+    for angle1, angle2 in rng.uniform(-10 * np.pi, 10 * np.pi, (1000, 2)):
+        assert angle_difference(angle1, angle2) == pytest.approx(
+            _angle_difference_reference(angle1, angle2), abs=1e-9
+        )
+
+def test_angle_difference_range():
+    # +π wraps to -π: the result lies in [-π, π)
+    assert angle_difference(0.0, np.pi) == pytest.approx(-np.pi)
+    assert angle_difference(0.0, -np.pi) == pytest.approx(-np.pi)
+    assert angle_difference(0.0, 0.5) == pytest.approx(0.5)
+
+def test_angle_difference_batch_matches_scalar():
+    rng = np.random.default_rng(1)
+    angles1, angles2 = rng.uniform(-10 * np.pi, 10 * np.pi, (2, 1000))
+    
+    expected = [angle_difference(a1, a2) for a1, a2 in zip(angles1, angles2)]
+    np.testing.assert_allclose(angle_difference_batch(angles1, angles2), expected, atol=1e-12)
+
+def test_angle_difference_batch_range():
+    diffs = angle_difference_batch(np.zeros(3), np.array([np.pi, -np.pi, 0.5]))
+    
+    np.testing.assert_allclose(diffs, [-np.pi, -np.pi, 0.5])
+
+@pytest.fixture
+def pixel_points():
+    """Pixel coordinates inside and outside a 320x240 frame."""
+    rng = np.random.default_rng(2)
+    return rng.uniform(-50, 400, (200, 2))
+
+def test_normalize_coordinates_matches_clip(pixel_points):
+    for x, y in pixel_points:
+        expected = np.clip([x / 320, y / 240], 0.0, 1.0)
+        np.testing.assert_allclose(normalize_coordinates(x, y, 320, 240), expected)
+
+def test_normalize_coordinates_batch_matches_scalar(pixel_points):
+    expected = [normalize_coordinates(x, y, 320, 240) for x, y in pixel_points]
+    
+    np.testing.assert_allclose(normalize_coordinates_batch(pixel_points, 320, 240), expected, atol=1e-12)
+
+def test_normalize_coordinates_empty_frame():
+    assert normalize_coordinates(10.0, 20.0, 0, 0) == (0.0, 0.0)
+    np.testing.assert_array_equal(normalize_coordinates_batch(np.array([[10.0, 20.0]]), 0, 0), [[0.0, 0.0]])
+
+def test_denormalize_coordinates_batch_matches_scalar():
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0.0, 1.0, (200, 2))
+    
+    expected = [denormalize_coordinates(x, y, 320, 240) for x, y in points]
+    np.testing.assert_array_equal(denormalize_coordinates_batch(points, 320, 240), expected)
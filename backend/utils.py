@@ -1,11 +1,10 @@
 """Utility functions for the Virtual Hat Try-On backend."""
 
+import struct
 import cv2
 import numpy as np
-from typing import Tuple, Dict, Any
-import base64
-from io import BytesIO
-from PIL import Image
+from numba import njit
+from typing import Tuple, Dict, Any, Optional
 
 def resize_frame_for_processing(frame: np.ndarray, target_width: int = 320) -> np.ndarray:
     """
@@ -42,51 +41,41 @@ def bytes_to_opencv_image(image_bytes: bytes) -> np.ndarray:
     img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
     return img
 
-def opencv_image_to_bytes(image: np.ndarray, format: str = '.jpg') -> bytes:
-    """
-    Convert OpenCV image to bytes.
-    
-    Args:
-        image: OpenCV image (BGR format)
-        format: Image format ('.jpg', '.png', etc.)
-        
-    Returns:
-        Image data as bytes
-    """
-    _, buffer = cv2.imencode(format, image)
-    return buffer.tobytes()
+# Raw frame header: <width:u16><height:u16><format:u8><reserved:3>, little-endian
+FRAME_HEADER = struct.Struct('<HHB3x')
+FRAME_FORMAT_RGB = 1
+FRAME_FORMAT_YUV420 = 2
+JPEG_SOI = b'\xff\xd8'
 
-def base64_to_opencv_image(base64_string: str) -> np.ndarray:
+def decode_frame(frame_bytes: bytes) -> Tuple[Optional[np.ndarray], bool]:
     """
-    Convert base64 string to OpenCV image.
+    Decode a WebSocket frame sent either as an encoded image or as raw pixels with a header.
     
     Args:
-        base64_string: Base64 encoded image
+        frame_bytes: FRAME_HEADER followed by RGB24 or I420 pixels, or JPEG
+            (or any other image format cv2.imdecode reads, e.g. PNG)
         
     Returns:
-        OpenCV image (BGR format)
+        (image, is_rgb) where image is None if the payload is invalid;
+        encoded images decode to BGR, raw frames to RGB
     """
-    # Remove data URL prefix if present
-    if ',' in base64_string:
-        base64_string = base64_string.split(',')[1]
-    
-    # Decode base64
-    image_bytes = base64.b64decode(base64_string)
-    return bytes_to_opencv_image(image_bytes)
-
-def opencv_image_to_base64(image: np.ndarray, format: str = '.jpg') -> str:
-    """
-    Convert OpenCV image to base64 string.
-    
-    Args:
-        image: OpenCV image (BGR format)  
-        format: Image format ('.jpg', '.png', etc.)
+    # Raw only with a valid header and an exact payload size; anything else is an encoded image
+    if frame_bytes[:2] != JPEG_SOI and len(frame_bytes) >= FRAME_HEADER.size:
+        width, height, frame_format = FRAME_HEADER.unpack_from(frame_bytes)
+        payload_size = len(frame_bytes) - FRAME_HEADER.size
         
-    Returns:
-        Base64 encoded image string
-    """
-    image_bytes = opencv_image_to_bytes(image, format)
-    return base64.b64encode(image_bytes).decode('utf-8')
+        if frame_format == FRAME_FORMAT_RGB and payload_size == width * height * 3:
+            frame = np.frombuffer(frame_bytes, np.uint8, offset=FRAME_HEADER.size)
+            return frame.reshape(height, width, 3), True
+        
+        if (frame_format == FRAME_FORMAT_YUV420 and width % 2 == 0 and height % 2 == 0
+                and payload_size == width * height * 3 // 2):
+            yuv = np.frombuffer(frame_bytes, np.uint8, offset=FRAME_HEADER.size)
+            return cv2.cvtColor(yuv.reshape(height * 3 // 2, width), cv2.COLOR_YUV2RGB_I420), True
+    
+    if not frame_bytes:
+        return None, False
+    return bytes_to_opencv_image(frame_bytes), False
 
 def normalize_coordinates(x: float, y: float, width: int, height: int) -> Tuple[float, float]:
     """
@@ -99,10 +88,28 @@ def normalize_coordinates(x: float, y: float, width: int, height: int) -> Tuple[
     Returns:
         Normalized coordinates (0-1 range)
     """
+    # Plain float math: np.clip on scalars costs a ufunc dispatch each
     norm_x = x / width if width > 0 else 0.0
     norm_y = y / height if height > 0 else 0.0
     
-    return np.clip(norm_x, 0.0, 1.0), np.clip(norm_y, 0.0, 1.0)
+    return min(max(norm_x, 0.0), 1.0), min(max(norm_y, 0.0), 1.0)
+
+def normalize_coordinates_batch(points: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Normalize an array of pixel coordinates to 0-1 range.
+    
+    Args:
+        points: (N, 2) array of pixel coordinates
+        width, height: Frame dimensions
+        
+    Returns:
+        (N, 2) array of normalized coordinates (0-1 range)
+    """
+    inv_size = np.array([
+        1.0 / width if width > 0 else 0.0,
+        1.0 / height if height > 0 else 0.0
+    ])
+    return np.clip(points * inv_size, 0.0, 1.0)
 
 def denormalize_coordinates(norm_x: float, norm_y: float, width: int, height: int) -> Tuple[int, int]:
     """
@@ -120,6 +127,19 @@ def denormalize_coordinates(norm_x: float, norm_y: float, width: int, height: in
     
     return x, y
 
+def denormalize_coordinates_batch(points: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Convert an array of normalized coordinates back to pixel coordinates.
+    
+    Args:
+        points: (N, 2) array of normalized coordinates (0-1 range)
+        width, height: Frame dimensions
+        
+    Returns:
+        (N, 2) integer array of pixel coordinates
+    """
+    return (points * np.array([width, height])).astype(np.int32)
+
 def calculate_distance_3d(point1: Dict[str, float], point2: Dict[str, float]) -> float:
     """
     Calculate 3D Euclidean distance between two points.
@@ -163,6 +183,7 @@ def clamp(value: float, min_val: float, max_val: float) -> float:
     """
     return max(min_val, min(value, max_val))
 
+@njit(cache=True)
 def angle_difference(angle1: float, angle2: float) -> float:
     """
     Calculate the shortest angular difference between two angles.
@@ -171,14 +192,21 @@ def angle_difference(angle1: float, angle2: float) -> float:
         angle1, angle2: Angles in radians
         
     Returns:
-        Angular difference (-π to π)
+        Angular difference in [-π, π) (+π maps to -π)
     """
-    diff = angle2 - angle1
-    while diff > np.pi:
-        diff -= 2 * np.pi
-    while diff < -np.pi:
-        diff += 2 * np.pi
-    return diff
+    return (angle2 - angle1 + np.pi) % (2 * np.pi) - np.pi
+
+def angle_difference_batch(angles1: np.ndarray, angles2: np.ndarray) -> np.ndarray:
+    """
+    Element-wise shortest angular difference between two arrays of angles.
+    
+    Args:
+        angles1, angles2: Arrays of angles in radians
+        
+    Returns:
+        Array of angular differences in [-π, π) (+π maps to -π)
+    """
+    return np.mod(angles2 - angles1 + np.pi, 2 * np.pi) - np.pi
 
 def create_rotation_matrix(yaw: float, pitch: float, roll: float) -> np.ndarray:
     """
@@ -190,29 +218,16 @@ def create_rotation_matrix(yaw: float, pitch: float, roll: float) -> np.ndarray:
     Returns:
         3x3 rotation matrix
     """
-    # Rotation around Z axis (yaw)
-    Rz = np.array([
-        [np.cos(yaw), -np.sin(yaw), 0],
-        [np.sin(yaw), np.cos(yaw), 0],
-        [0, 0, 1]
-    ])
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cr, sr = np.cos(roll), np.sin(roll)
     
-    # Rotation around Y axis (pitch)
-    Ry = np.array([
-        [np.cos(pitch), 0, np.sin(pitch)],
-        [0, 1, 0],
-        [-np.sin(pitch), 0, np.cos(pitch)]
+    # Closed form of Rz(yaw) @ Ry(pitch) @ Rx(roll)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr]
     ])
-    
-    # Rotation around X axis (roll)
-    Rx = np.array([
-        [1, 0, 0],
-        [0, np.cos(roll), -np.sin(roll)],
-        [0, np.sin(roll), np.cos(roll)]
-    ])
-    
-    # Combined rotation (order: Z, Y, X)
-    return Rz @ Ry @ Rx
 
 def log_performance(func_name: str, execution_time: float, frame_rate: float = None):
     """
@@ -4,6 +4,7 @@ import React, { useEffect, useRef, useState } from 'react';
 import { useWebcam } from '../hooks/useWebcam';
 import { useWebSocket } from '../hooks/useWebSocket';
 import { captureFrameAsBlob, FrameRateLimiter, FramePerformanceMonitor } from '../lib/frameCapture';
+import { captureFrameAsRGB } from '../lib/rawFrame';
 import WebcamCapture from './WebcamCapture';
 import HatScene from './HatScene';
 
@@ -24,6 +25,7 @@ export default function HatTryOn() {
     error: wsError,
     lastMessage,
     sendFrame,
+    isLocalBackend,
     connect: connectWS,
     disconnect: disconnectWS
   } = useWebSocket();
@@ -52,16 +54,28 @@ export default function HatTryOn() {
     performanceMonitorRef.current.recordFrame();
 
     try {
-      // Capture frame from video
-      const frameBlob = await captureFrameAsBlob(videoRef.current, {
-        maxWidth: 320,
-        maxHeight: 240,
-        quality: 0.7,
-        format: 'jpeg'
-      });
+      if (isLocalBackend) {
+        // Send raw RGB to a local backend so it can skip JPEG decoding
+        const frameBuffer = captureFrameAsRGB(videoRef.current, {
+          maxWidth: 320,
+          maxHeight: 240
+        });
 
-      if (frameBlob) {
-        sendFrame(frameBlob);
+        if (frameBuffer) {
+          sendFrame(frameBuffer);
+        }
+      } else {
+        // Capture frame from video
+        const frameBlob = await captureFrameAsBlob(videoRef.current, {
+          maxWidth: 320,
+          maxHeight: 240,
+          quality: 0.7,
+          format: 'jpeg'
+        });
+
+        if (frameBlob) {
+          sendFrame(frameBlob);
+        }
       }
     } catch (error) {
       console.error('Error processing video frame:', error);
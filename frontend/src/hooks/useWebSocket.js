@@ -5,6 +5,9 @@ import { useEffect, useRef, useState, useCallback } from 'react';
 const WEBSOCKET_URL = 'ws://localhost:8000/ws';
 const RECONNECT_DELAY = 3000;
 const MAX_RECONNECT_ATTEMPTS = 5;
+// Raw frames are only worth their bandwidth when the backend is on this machine
+const IS_LOCAL_BACKEND = ['localhost', '127.0.0.1'].includes(new URL(WEBSOCKET_URL).hostname);
+const textDecoder = new TextDecoder();
 
 export const useWebSocket = () => {
   const [isConnected, setIsConnected] = useState(false);
@@ -26,6 +29,7 @@ export const useWebSocket = () => {
 
     try {
       const ws = new WebSocket(WEBSOCKET_URL);
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -38,7 +42,9 @@ export const useWebSocket = () => {
 
       ws.onmessage = (event) => {
         try {
-          const message = JSON.parse(event.data);
+          // Backend sends JSON as UTF-8 bytes in a binary frame
+          const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+          const message = JSON.parse(text);
           setLastMessage(message);
           
           if (message.error) {
@@ -101,6 +107,12 @@ export const useWebSocket = () => {
 
   const sendFrame = useCallback((imageData) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
+      // Raw frames are already an ArrayBuffer
+      if (imageData instanceof ArrayBuffer) {
+        wsRef.current.send(imageData);
+        return;
+      }
+
       // Convert blob to array buffer and send as binary data
       imageData.arrayBuffer().then((buffer) => {
         if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -128,6 +140,7 @@ export const useWebSocket = () => {
     error,
     lastMessage,
     sendFrame,
+    isLocalBackend: IS_LOCAL_BACKEND,
     connect,
     disconnect
   };
@@ -0,0 +1,47 @@
+// Raw frame transport for a local backend: skips JPEG encode/decode entirely.
+// Binary layout: <width:u16><height:u16><format:u8><reserved:3> (little-endian) + pixels
+export const FRAME_HEADER_SIZE = 8;
+export const FRAME_FORMAT_RGB = 1;
+
+let captureCanvas = null;
+
+// Capture the current video frame, downscaled, as header + packed RGB24 bytes
+export const captureFrameAsRGB = (video, { maxWidth = 320, maxHeight = 240 } = {}) => {
+  const videoWidth = video.videoWidth;
+  const videoHeight = video.videoHeight;
+  if (!videoWidth || !videoHeight) {
+    return null;
+  }
+
+  const scale = Math.min(1, maxWidth / videoWidth, maxHeight / videoHeight);
+  const width = Math.round(videoWidth * scale);
+  const height = Math.round(videoHeight * scale);
+
+  if (!captureCanvas) {
+    captureCanvas = document.createElement('canvas');
+  }
+  if (captureCanvas.width !== width || captureCanvas.height !== height) {
+    captureCanvas.width = width;
+    captureCanvas.height = height;
+  }
+
+  const ctx = captureCanvas.getContext('2d', { willReadFrequently: true });
+  ctx.drawImage(video, 0, 0, width, height);
+  const rgba = ctx.getImageData(0, 0, width, height).data;
+
+  const buffer = new ArrayBuffer(FRAME_HEADER_SIZE + width * height * 3);
+  const header = new DataView(buffer, 0, FRAME_HEADER_SIZE);
+  header.setUint16(0, width, true);
+  header.setUint16(2, height, true);
+  header.setUint8(4, FRAME_FORMAT_RGB);
+
+  // Drop the alpha channel
+  const rgb = new Uint8Array(buffer, FRAME_HEADER_SIZE);
+  for (let i = 0, j = 0; i < rgba.length; i += 4, j += 3) {
+    rgb[j] = rgba[i];
+    rgb[j + 1] = rgba[i + 1];
+    rgb[j + 2] = rgba[i + 2];
+  }
+
+  return buffer;
+};